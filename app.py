@@ -6,112 +6,52 @@ Converted from MATLAB GUI (quarterCarUI.m).
 """
 
 import os
+import time
+from functools import lru_cache
+from typing import Tuple
 from dash import Dash, html, dcc, callback, Input, Output, State, no_update
-import plotly.graph_objects as go
-import json
+import numpy as np
+import plotly.io as pio
 
-from simulation import SimulationParams, run_simulation, SimulationResult
-from plotting import create_animation_frame, create_displacement_plot
+from simulation import SimulationParams, run_simulation, SimulationResult, downsample_result
+from plotting import ANIMATION_LAYOUT, create_animation_frames, create_displacement_plot, encode_array
+
+# Dash encodes callback outputs with Plotly's JSON encoder. Its "auto" engine
+# quietly falls back to the much slower stdlib json if orjson is missing;
+# pin it so a broken install fails at startup instead.
+pio.json.config.default_engine = 'orjson'
 
 
 # Initialize the Dash app
-app = Dash(__name__)
+# Page styling lives in assets/styles.css, which Dash serves as a static file
+app = Dash(
+    __name__,
+    meta_tags=[{
+        'name': 'viewport',
+        'content': 'width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no'
+    }]
+)
 app.title = "Quarter Car Model"
 
 # Expose the Flask server for gunicorn
 server = app.server
 
-# Animation interval in milliseconds (33ms ≈ 30fps)
+# Spacing in milliseconds of the down-sampled animation frames at 1x speed
+# (33ms ≈ 30fps); see build_simulation
 ANIMATION_INTERVAL_MS = 33
 
-# Custom CSS styles
-styles = {
-    'container': {
-        'display': 'flex',
-        'flexDirection': 'row',
-        'height': '100vh',
-        'fontFamily': '-apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif',
-        'backgroundColor': '#f5f5f5'
-    },
-    'control_panel': {
-        'width': '320px',
-        'padding': '20px',
-        'backgroundColor': '#ffffff',
-        'borderRight': '1px solid #e0e0e0',
-        'overflowY': 'auto'
-    },
-    'plot_container': {
-        'flex': '1',
-        'display': 'flex',
-        'flexDirection': 'row',
-        'padding': '10px'
-    },
-    'plot_panel': {
-        'flex': '1',
-        'padding': '10px'
-    },
-    'title': {
-        'fontSize': '24px',
-        'fontWeight': 'bold',
-        'marginBottom': '20px',
-        'color': '#333'
-    },
-    'slider_container': {
-        'marginBottom': '25px'
-    },
-    'slider_label': {
-        'fontSize': '14px',
-        'fontWeight': '500',
-        'color': '#555',
-        'marginBottom': '10px'
-    },
-    'button': {
-        'width': '100%',
-        'padding': '15px',
-        'fontSize': '16px',
-        'fontWeight': 'bold',
-        'backgroundColor': '#4CAF50',
-        'color': 'white',
-        'border': 'none',
-        'borderRadius': '8px',
-        'cursor': 'pointer',
-        'marginTop': '20px'
-    },
-    'status': {
-        'marginTop': '15px',
-        'padding': '10px',
-        'backgroundColor': '#e8f5e9',
-        'borderRadius': '4px',
-        'fontSize': '14px',
-        'color': '#2e7d32'
-    }
-}
+# Initial slider values
+DEFAULT_KS = 48000
+DEFAULT_CS = 1000
+DEFAULT_VEL = 1.5
+DEFAULT_KT = 200000
 
 # App layout
-app.index_string = '''
-<!DOCTYPE html>
-<html>
-    <head>
-        {%metas%}
-        <title>{%title%}</title>
-        <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
-        {%favicon%}
-        {%css%}
-    </head>
-    <body>
-        {%app_entry%}
-        <footer>
-            {%config%}
-            {%scripts%}
-            {%renderer%}
-        </footer>
-    </body>
-</html>
-'''
-
 app.layout = html.Div([
     # Hidden stores for simulation data
-    dcc.Store(id='simulation-data'),
+    # Simulation bundle: frame count, time series and animation frames, written
+    # together once per simulation
+    dcc.Store(id='sim-bundle'),
     dcc.Store(id='frame-index', data=0),
     dcc.Store(id='is-running', data=False),
     dcc.Store(id='first-run', data=True),  # Track if this is the first simulation run
@@ -119,17 +59,7 @@ app.layout = html.Div([
     dcc.Store(id='animation-duration-ms', data=3000),  # Total animation duration in ms
     dcc.Store(id='base-duration-ms', data=3000),  # Base duration before speed factor
     
-    # Animation frames store
-    dcc.Store(id='animation-frames'),
-    dcc.Store(id='displacement-base-figure'),  # Base displacement plot (without markers)
-    
-    # Animation interval component - fixed 30ms (~33fps) tick rate
-    dcc.Interval(
-        id='animation-interval',
-        interval=30,
-        n_intervals=0,
-        disabled=True
-    ),
+    dcc.Store(id='displacement-base-figure'),  # Base displacement plot (markers at the first frame)
     
     # Main container
     html.Div([
@@ -147,7 +77,7 @@ app.layout = html.Div([
                         min=10000,
                         max=100000,
                         step=1000,
-                        value=48000,
+                        value=DEFAULT_KS,
                         marks={10000: '10k', 50000: '50k', 100000: '100k'},
                         tooltip={'placement': 'bottom', 'always_visible': True}
                     )
@@ -161,7 +91,7 @@ app.layout = html.Div([
                         min=100,
                         max=5000,
                         step=100,
-                        value=1000,
+                        value=DEFAULT_CS,
                         marks={100: '100', 2500: '2500', 5000: '5000'},
                         tooltip={'placement': 'bottom', 'always_visible': True}
                     )
@@ -175,7 +105,7 @@ app.layout = html.Div([
                         min=0.5,
                         max=3,
                         step=0.1,
-                        value=1.5,
+                        value=DEFAULT_VEL,
                         marks={0.5: '0.5', 1.5: '1.5', 3: '3'},
                         tooltip={'placement': 'bottom', 'always_visible': True}
                     )
@@ -189,7 +119,7 @@ app.layout = html.Div([
                         min=50000,
                         max=500000,
                         step=10000,
-                        value=200000,
+                        value=DEFAULT_KT,
                         marks={50000: '50k', 250000: '250k', 500000: '500k'},
                         tooltip={'placement': 'bottom', 'always_visible': True}
                     )
@@ -216,7 +146,7 @@ app.layout = html.Div([
                     id="loading-animation",
                     type="default",
                     children=[
-                        dcc.Graph(id='animation-graph', style={'height': 'calc(100% - 60px)'}, config={'displayModeBar': False, 'staticPlot': True}),
+                        dcc.Graph(id='animation-graph', figure={'data': [], 'layout': ANIMATION_LAYOUT}, style={'height': 'calc(100% - 60px)'}, config={'displayModeBar': False, 'staticPlot': True}),
                         html.Div(id='loading-output', style={'display': 'none'}) # Dummy output to trigger loader
                     ],
                     custom_spinner=html.H2(["Computing Simulation...", html.Br(), "Please Wait"], style={'marginTop': '100px', 'color': '#333'})
@@ -272,54 +202,132 @@ app.layout = html.Div([
 
 
 def serialize_result(result: SimulationResult) -> dict:
-    """Convert SimulationResult to JSON-serializable dict."""
+    """
+    Convert SimulationResult to the dict kept in the browser's dcc.Store.
+    
+    Only what the clientside callbacks read is sent: the frame count and the
+    time/displacement series used for the displacement marker. The road
+    profile, longitudinal position and geometry constants are already baked
+    into the animation frames, so they never leave the server.
+    
+    The series are packed row-wise into one float32 buffer and sent as a
+    single base64 string (see encode_array), listed in 'fields' order.
+    """
+    fields = ('time', 'z_s', 'z_u')
     return {
-        'time': result.time.tolist(),
-        'z_s': result.z_s.tolist(),
-        'z_u': result.z_u.tolist(),
-        'u': result.u.tolist(),
-        'lon': result.lon.tolist(),
-        'road_x': result.road_x.tolist(),
-        'road_z': result.road_z.tolist(),
-        'L0_s': result.L0_s,
-        'L0_u': result.L0_u,
-        'h_s': result.h_s,
-        'h_u': result.h_u,
-        'a': result.a,
-        'Kt': result.Kt
+        'num_frames': len(result.time),
+        'fields': fields,
+        'series': encode_array(result.pack(fields))
+    }
+
+
+def serialize_frames(frames: dict) -> dict:
+    """
+    Convert animation frames to the form kept in the browser's dcc.Store.
+    
+    The per-frame coordinates of every moving trace are packed into one
+    float32 buffer sent as a single base64 string (see encode_array): for each
+    trace in order, its x array then its y array, each flattened frame by
+    frame. 'points' holds each trace's point count per frame, which is all the
+    browser needs to slice a frame back out (quarterCar.frameXY in
+    assets/clientside.js). Static traces are passed through as they are.
+    """
+    coords = [a.ravel() for xy in zip(frames['x'], frames['y']) for a in xy]
+    return {
+        'num_frames': frames['num_frames'],
+        'static_traces': frames['static_traces'],
+        'traces': frames['traces'],
+        'points': [x.shape[1] for x in frames['x']],
+        'coords': encode_array(np.concatenate(coords)),
+        'ranges': frames['ranges'],
+        'titles': frames['titles']
+    }
+
+
+@lru_cache(maxsize=64)
+def build_simulation(ks: float, cs: float, kt: float, vel: float) -> Tuple[dict, dict, float]:
+    """
+    Run the simulation and pre-compute everything the browser needs from it.
+    
+    The animation never shows more than one frame per ANIMATION_INTERVAL_MS,
+    so frames are built from the result down-sampled to that rate. The
+    displacement plot only depends on the finished simulation, so it is built
+    here once, from the full-resolution result, rather than per request.
+    
+    Memoized on the slider values, so pressing Start again with unchanged
+    settings (or returning to a previous setting) skips the ODE solve, the
+    frame build, the displacement plot and the serialization of all three.
+    Callers should pass the values through slider_key() and must treat the
+    returned objects as read-only.
+    
+    Returns:
+        Tuple of (store bundle, base displacement figure dict with the
+        current-time markers at the first sample, real-time duration of the
+        simulation in ms).
+    """
+    params = SimulationParams(
+        Ks=ks,
+        Cs=cs,
+        Kt=kt,
+        vel=vel
+    )
+    result = run_simulation(params)
+    
+    display_frames = int(result.time[-1] * 1000 / ANIMATION_INTERVAL_MS) + 1
+    frame_result = downsample_result(result, display_frames)
+    frames = serialize_frames(create_animation_frames(frame_result))
+    
+    # Bundle the per-frame samples and frames into a single store write
+    bundle = {
+        'num_frames': frames['num_frames'],
+        'sim': serialize_result(frame_result),
+        'frames': frames
     }
+    
+    disp_fig_data = create_displacement_plot(result, current_time_idx=0)
+    
+    return bundle, disp_fig_data, float(result.time[-1] * 1000)
 
 
-def deserialize_result(data: dict) -> SimulationResult:
-    """Convert dict back to SimulationResult."""
-    import numpy as np
-    return SimulationResult(
-        time=np.array(data['time']),
-        z_s=np.array(data['z_s']),
-        z_u=np.array(data['z_u']),
-        u=np.array(data['u']),
-        lon=np.array(data['lon']),
-        road_x=np.array(data['road_x']),
-        road_z=np.array(data['road_z']),
-        L0_s=data['L0_s'],
-        L0_u=data['L0_u'],
-        h_s=data['h_s'],
-        h_u=data['h_u'],
-        a=data['a'],
-        Kt=data['Kt']
+def slider_key(*values: float) -> Tuple[float, ...]:
+    """
+    Round slider values so they can be used as a build_simulation cache key.
+    
+    Fractional slider steps come back with float noise (1.2 may arrive as
+    1.2000000000000002), which would otherwise miss the cache.
+    """
+    return tuple(round(float(v), 6) for v in values)
+
+
+def warm_up() -> None:
+    """
+    Build and encode the simulation for the initial slider values.
+
+    Plotly loads its default template and JSON encoder lazily, which costs
+    the first build several times more than later ones. Doing it at import
+    pays that once at boot rather than on a user's first Start click: with
+    preload_app (gunicorn.conf.py) it runs in the gunicorn master, and every
+    worker inherits the loaded state and the build_simulation cache when it
+    forks. The default simulation is left in that cache, so the most common
+    first click is a hit.
+    """
+    bundle, disp_fig_data, _ = build_simulation(
+        *slider_key(DEFAULT_KS, DEFAULT_CS, DEFAULT_KT, DEFAULT_VEL)
     )
+    pio.json.to_json_plotly([bundle, disp_fig_data])
+
+
+warm_up()
 
 
 @callback(
-    Output('simulation-data', 'data'),
-    Output('animation-frames', 'data'),
+    Output('sim-bundle', 'data'),
     Output('displacement-base-figure', 'data'),
     Output('base-duration-ms', 'data'),
     Output('animation-duration-ms', 'data'),
     Output('animation-start-time', 'data', allow_duplicate=True),
     Output('frame-index', 'data', allow_duplicate=True),
     Output('is-running', 'data', allow_duplicate=True),
-    Output('animation-interval', 'disabled', allow_duplicate=True),
     Output('status-display', 'children'),
     Output('loading-output', 'children'),
     Output('displacement-content', 'style'),
@@ -339,42 +347,13 @@ def deserialize_result(data: dict) -> SimulationResult:
 def start_simulation(n_clicks, ks, cs, vel, kt, is_first_run):
     """Handle start button click - run simulation and pre-compute frames."""
     if n_clicks is None:
-        return no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update
-    
-    # Create simulation parameters
-    params = SimulationParams(
-        Ks=ks,
-        Cs=cs,
-        Kt=kt,
-        vel=vel
-    )
-    
-    # Run simulation
-    result = run_simulation(params)
-    
-    # Serialize result for storage
-    data = serialize_result(result)
-    
-    # Pre-compute all animation frames
-    # We extract the updating parts of the figure for each frame
-    frames = []
-    num_frames = len(result.time)
+        return no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update, no_update
     
-    for i in range(num_frames):
-        fig = create_animation_frame(result, i)
-        frame_data = json.loads(fig.to_json())['data']
-        layout_update = {
-            'title': fig.layout.title.text,
-            'xaxis': {'range': fig.layout.xaxis.range}
-        }
-        frames.append({'data': frame_data, 'layout': layout_update})
-    
-    # Pre-compute base displacement figure (without markers)
-    disp_fig = create_displacement_plot(result, current_time_idx=None)
-    disp_fig_data = json.loads(disp_fig.to_json())
+    # Run simulation and pre-compute frames and plots (cached per slider setting)
+    bundle, disp_fig_data, base_duration_ms = build_simulation(*slider_key(ks, cs, kt, vel))
+    num_frames = bundle['num_frames']
     
     # Calculate animation duration (always start at 1x speed)
-    base_duration_ms = result.time[-1] * 1000  # Real-time duration
     animation_duration_ms = base_duration_ms  # Start at 1x speed
     
     status = f"Simulation: v={vel} m/s, duration={base_duration_ms/1000:.1f}s"
@@ -382,8 +361,8 @@ def start_simulation(n_clicks, ks, cs, vel, kt, is_first_run):
     # Always reset first-run to True for each new simulation
     # This ensures controls are hidden during the initial animation
     # Use -1 as start_time to signal clientside callback to initialize it
-    return (data, frames, disp_fig_data, base_duration_ms, animation_duration_ms, -1,
-            0, True, False, status, "loaded", 
+    return (bundle, disp_fig_data, base_duration_ms, animation_duration_ms, -1,
+            0, True, status, "loaded", 
             {'visibility': 'hidden', 'height': '100%'}, 
             num_frames - 1, 0,
             {'display': 'none'},
@@ -391,123 +370,138 @@ def start_simulation(n_clicks, ks, cs, vel, kt, is_first_run):
             1)  # Reset video speed to 1x
 
 
-# Clientside callback for time-based frame advancement
+# Clientside animation loop driven by requestAnimationFrame
+# (Re)started whenever the running state, start time or duration changes. The
+# loop runs entirely in the browser, in step with the display's refresh, and
+# pauses with it while the tab is hidden. A new frame index is only dispatched
+# when the displayed frame changes; frames are ANIMATION_INTERVAL_MS apart at
+# 1x speed (see build_simulation), so no separate throttle is needed.
 app.clientside_callback(
     """
-    function(n_intervals, start_time, duration_ms, sim_data, is_running) {
-        // Return [frame_index, start_time, is_running, interval_disabled, slider_value]
-        if (!is_running || !sim_data) {
-            return [window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update];
+    function(is_running, start_time, duration_ms, bundle) {
+        if (window.quarterCar._raf) {
+            cancelAnimationFrame(window.quarterCar._raf);
+            window.quarterCar._raf = null;
+        }
+        if (!is_running || !bundle) {
+            return window.dash_clientside.no_update;
         }
         
-        var num_frames = sim_data.time.length;
-        var now = Date.now();
+        var set_props = window.dash_clientside.set_props;
+        var num_frames = bundle.num_frames;
         
         // Initialize start time if -1 (new animation)
         if (start_time === -1 || start_time === null) {
-            start_time = now;
+            start_time = Date.now();
         }
         
-        // Calculate elapsed time and corresponding frame
-        var elapsed = now - start_time;
-        var progress = Math.min(elapsed / duration_ms, 1.0);
-        var frame = Math.floor(progress * (num_frames - 1));
+        var last_frame = -1;
         
-        if (frame >= num_frames - 1) {
-            // Animation complete - stop at last frame
-            return [num_frames - 1, start_time, false, true, num_frames - 1];
+        function tick() {
+            // Calculate elapsed time and corresponding frame
+            var elapsed = Date.now() - start_time;
+            var progress = Math.min(elapsed / duration_ms, 1.0);
+            var frame = Math.floor(progress * (num_frames - 1));
+            
+            if (frame >= num_frames - 1) {
+                // Animation complete - stop at last frame
+                window.quarterCar._raf = null;
+                set_props('frame-index', {data: num_frames - 1});
+                set_props('time-slider', {value: num_frames - 1});
+                set_props('is-running', {data: false});
+                return;
+            }
+            
+            if (frame !== last_frame) {
+                last_frame = frame;
+                set_props('frame-index', {data: frame});
+                set_props('time-slider', {value: frame});
+            }
+            window.quarterCar._raf = requestAnimationFrame(tick);
         }
         
-        return [frame, start_time, true, false, frame];
+        window.quarterCar._raf = requestAnimationFrame(tick);
+        return start_time;
     }
     """,
-    Output('frame-index', 'data'),
     Output('animation-start-time', 'data'),
-    Output('is-running', 'data'),
-    Output('animation-interval', 'disabled'),
-    Output('time-slider', 'value'),
-    Input('animation-interval', 'n_intervals'),
-    State('animation-start-time', 'data'),
-    State('animation-duration-ms', 'data'),
-    State('simulation-data', 'data'),
-    State('is-running', 'data')
+    Input('is-running', 'data'),
+    Input('animation-start-time', 'data'),
+    Input('animation-duration-ms', 'data'),
+    State('sim-bundle', 'data')
 )
 
 
-# Clientside callback for smooth animation figure update
+# Clientside callback drawing both graphs for the current frame
+# One callback per frame-index change, so each tick costs a single dispatch.
+# The static animation layout is set once as the graph's initial figure. A new
+# simulation replaces the traces of both graphs; every later frame only patches
+# the animation's moving trace coordinates, title and x-range and the two
+# displacement markers, so Plotly restyles in place. The road never moves; the
+# x-range alone scrolls it.
 app.clientside_callback(
     """
-    function(frame_idx, frames_data) {
-        if (!frames_data || frame_idx === null || frame_idx >= frames_data.length) {
-            return window.dash_clientside.no_update;
+    function(frame_idx, bundle, base_fig_data) {
+        var no_update = window.dash_clientside.no_update;
+        if (!bundle || frame_idx === null || frame_idx < 0 || frame_idx >= bundle.num_frames) {
+            return [no_update, no_update];
         }
         
-        var frame = frames_data[frame_idx];
+        var triggered = window.dash_clientside.callback_context.triggered.map(function(t) {
+            return t.prop_id;
+        });
         
-        return {
-            'data': frame.data,
-            'layout': {
-                'title': frame.layout.title,
-                'xaxis': frame.layout.xaxis,
-                'yaxis': {'range': [-0.1, 1.15], 'title': 'z [m]'},
-                'margin': {'l': 50, 'r': 50, 't': 50, 'b': 50},
-                'height': 500,
-                'uirevision': 'constant'
+        // Animation graph
+        // Static traces come first and are only sent with a new simulation
+        var frames_data = bundle.frames;
+        var n_static = frames_data.static_traces.length;
+        var anim = new window.dash_clientside.Patch();
+        if (triggered.indexOf('sim-bundle.data') !== -1) {
+            anim.assign(['data'], frames_data.static_traces.concat(
+                frames_data.traces.map(function(trace, k) {
+                    var xy = window.quarterCar.frameXY(frames_data, k, frame_idx);
+                    return Object.assign({}, trace, {'x': xy[0], 'y': xy[1]});
+                })
+            ));
+        } else {
+            for (var k = 0; k < frames_data.traces.length; k++) {
+                var xy = window.quarterCar.frameXY(frames_data, k, frame_idx);
+                anim.assign(['data', n_static + k, 'x'], xy[0]);
+                anim.assign(['data', n_static + k, 'y'], xy[1]);
             }
-        };
-    }
-    """,
-    Output('animation-graph', 'figure'),
-    Input('frame-index', 'data'),
-    State('animation-frames', 'data')
-)
-
-
-# Clientside callback for displacement plot marker update
-app.clientside_callback(
-    """
-    function(frame_idx, base_fig_data, sim_data) {
-        if (!base_fig_data || !sim_data || frame_idx === null) {
-            return window.dash_clientside.no_update;
         }
+        anim.assign(['layout', 'title', 'text'], frames_data.titles[frame_idx]);
+        anim.assign(['layout', 'xaxis', 'range'], frames_data.ranges[frame_idx]);
         
-        // Clone the base figure
-        var fig = JSON.parse(JSON.stringify(base_fig_data));
-        
-        // Add marker traces if frame_idx is valid
-        if (frame_idx >= 0 && frame_idx < sim_data.time.length) {
-            var current_time = sim_data.time[frame_idx];
-            var current_z_s = sim_data.z_s[frame_idx];
-            var current_z_u = sim_data.z_u[frame_idx];
-            
-            // Add sprung mass marker
-            fig.data.push({
-                x: [current_time],
-                y: [current_z_s],
-                mode: 'markers',
-                marker: {color: 'black', size: 12, symbol: 'circle'},
-                showlegend: false,
-                hoverinfo: 'skip'
-            });
-            
-            // Add unsprung mass marker
-            fig.data.push({
-                x: [current_time],
-                y: [current_z_u],
-                mode: 'markers',
-                marker: {color: 'black', size: 12, symbol: 'circle'},
-                showlegend: false,
-                hoverinfo: 'skip'
-            });
+        // Displacement graph: its last two traces are the sprung and unsprung
+        // mass markers
+        if (!base_fig_data) {
+            return [anim.build(), no_update];
+        }
+        if (triggered.indexOf('displacement-base-figure.data') !== -1) {
+            // New simulation: the base figure already has the markers at the
+            // first frame, where a new simulation starts
+            return [anim.build(), base_fig_data];
         }
         
-        return fig;
+        // Otherwise only the marker positions change
+        var sim = window.quarterCar.simArrays(bundle.sim);
+        var current_time = sim.time[frame_idx];
+        var n_base = base_fig_data.data.length - 2;
+        var disp = new window.dash_clientside.Patch();
+        [sim.z_s[frame_idx], sim.z_u[frame_idx]].forEach(function(z, k) {
+            disp.assign(['data', n_base + k, 'x'], [current_time]);
+            disp.assign(['data', n_base + k, 'y'], [z]);
+        });
+        
+        return [anim.build(), disp.build()];
     }
     """,
+    Output('animation-graph', 'figure'),
     Output('displacement-graph', 'figure'),
     Input('frame-index', 'data'),
-    State('displacement-base-figure', 'data'),
-    State('simulation-data', 'data')
+    Input('sim-bundle', 'data'),
+    Input('displacement-base-figure', 'data')
 )
 
 
@@ -532,26 +526,27 @@ def update_controls_visibility(is_running, is_first_run):
         return {'visibility': 'visible', 'height': '100%'}, {'display': 'flex', 'alignItems': 'top', 'padding': '0px', 'marginTop': '0px'}, no_update
 
 
-# Callback for slider scrubbing - only active when paused
-@callback(
+# Clientside callback for slider scrubbing - only active when paused
+# While running the slider just mirrors the animation loop, so handling it in
+# the browser avoids a server round-trip for every displayed frame.
+app.clientside_callback(
+    """
+    function(slider_value, bundle, is_running) {
+        // Only respond to slider when animation is paused
+        if (!bundle || slider_value === null || is_running) {
+            return window.dash_clientside.no_update;
+        }
+        
+        // Animation is paused - user is scrubbing, update the frame
+        return slider_value;
+    }
+    """,
     Output('frame-index', 'data', allow_duplicate=True),
     Input('time-slider', 'value'),
-    State('simulation-data', 'data'),
+    State('sim-bundle', 'data'),
     State('is-running', 'data'),
     prevent_initial_call=True
 )
-def on_slider_change(slider_value, sim_data, is_running):
-    """Handle slider scrubbing - only update frame when paused."""
-    if sim_data is None or slider_value is None:
-        return no_update
-    
-    # Only respond to slider when animation is paused
-    # When running, ignore slider changes (they come from the interval sync)
-    if is_running:
-        return no_update
-    
-    # Animation is paused - user is scrubbing, update the frame
-    return slider_value
 
 
 # Callback for video speed slider change
@@ -561,11 +556,11 @@ def on_slider_change(slider_value, sim_data, is_running):
     Input('video-speed-dropdown', 'value'),
     State('base-duration-ms', 'data'),
     State('frame-index', 'data'),
-    State('simulation-data', 'data'),
+    State('time-slider', 'max'),
     State('is-running', 'data'),
     prevent_initial_call=True
 )
-def on_speed_change(speed_factor, base_duration_ms, frame_idx, sim_data, is_running):
+def on_speed_change(speed_factor, base_duration_ms, frame_idx, slider_max, is_running):
     """Update animation duration when speed selector changes."""
     if base_duration_ms is None or speed_factor is None:
         return no_update, no_update
@@ -574,13 +569,12 @@ def on_speed_change(speed_factor, base_duration_ms, frame_idx, sim_data, is_runn
     new_duration_ms = base_duration_ms / speed_factor
     
     # If animation is running, adjust start_time to maintain current frame position
-    if is_running and sim_data is not None:
-        num_frames = len(sim_data['time'])
+    if is_running and slider_max is not None:
+        num_frames = slider_max + 1
         if num_frames > 1:
             # Calculate current progress and set start_time accordingly
             progress = frame_idx / (num_frames - 1)
             elapsed = progress * new_duration_ms
-            import time
             new_start_time = int(time.time() * 1000) - elapsed
             return new_duration_ms, new_start_time
     
@@ -590,41 +584,40 @@ def on_speed_change(speed_factor, base_duration_ms, frame_idx, sim_data, is_runn
 # Callback for play/pause button
 @callback(
     Output('is-running', 'data', allow_duplicate=True),
-    Output('animation-interval', 'disabled', allow_duplicate=True),
     Output('play-pause-button', 'children'),
     Output('frame-index', 'data', allow_duplicate=True),
     Output('animation-start-time', 'data', allow_duplicate=True),
     Input('play-pause-button', 'n_clicks'),
     State('is-running', 'data'),
-    State('simulation-data', 'data'),
+    State('time-slider', 'max'),
     State('frame-index', 'data'),
     State('animation-duration-ms', 'data'),
     prevent_initial_call=True
 )
-def toggle_play_pause(n_clicks, is_running, sim_data, frame_idx, duration_ms):
+def toggle_play_pause(n_clicks, is_running, slider_max, frame_idx, duration_ms):
     """Toggle play/pause state."""
-    if n_clicks is None or sim_data is None:
-        return no_update, no_update, no_update, no_update, no_update
+    if n_clicks is None or slider_max is None:
+        return no_update, no_update, no_update, no_update
     
-    num_frames = len(sim_data['time'])
+    # The slider spans every frame, so its max is the last frame index
+    num_frames = slider_max + 1
     
     # If currently not running
     if not is_running:
         # If at end, restart from beginning
         if frame_idx >= num_frames - 1:
             # Restart: reset frame to 0 and set start_time to -1 to initialize
-            return True, False, '⏸', 0, -1
+            return True, '⏸', 0, -1
         else:
             # Resume from current position: calculate start_time to match current frame
             # We need to set start_time such that elapsed time corresponds to current frame
             progress = frame_idx / (num_frames - 1)
             elapsed = progress * duration_ms
-            import time
             start_time = int(time.time() * 1000) - elapsed
-            return True, False, '⏸', no_update, start_time
+            return True, '⏸', no_update, start_time
     else:
         # Pause
-        return False, True, '▶', no_update, no_update
+        return False, '▶', no_update, no_update
 
 
 # Callback to update button when animation completes
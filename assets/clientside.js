@@ -0,0 +1,57 @@
+/* Quarter Car Model - Helpers shared by the clientside callbacks in app.py */
+
+window.quarterCar = window.quarterCar || {};
+
+/*
+ * Decode a base64 string of little-endian float32 values (see encode_array in
+ * plotting.py) into a Float32Array backed directly by the decoded bytes.
+ */
+window.quarterCar.decodeFloat32 = function(b64) {
+    var binary = atob(b64);
+    var bytes = new Uint8Array(binary.length);
+    for (var i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return new Float32Array(bytes.buffer);
+};
+
+/*
+ * Time series of the current simulation (sim-bundle.data.sim, see
+ * serialize_result in app.py), keyed by field name. The packed buffer is
+ * decoded once per simulation and each series is a subarray view into it;
+ * later calls with the same store object are free.
+ */
+window.quarterCar.simArrays = function(sim_data) {
+    var cache = window.quarterCar._simCache;
+    if (!cache || cache.source !== sim_data) {
+        var series = window.quarterCar.decodeFloat32(sim_data.series);
+        var n = sim_data.num_frames;
+        cache = window.quarterCar._simCache = {source: sim_data};
+        sim_data.fields.forEach(function(name, k) {
+            cache[name] = series.subarray(k * n, (k + 1) * n);
+        });
+    }
+    return cache;
+};
+
+/*
+ * Coordinates of trace k in frame i of the current animation frames store
+ * (see serialize_frames in app.py), as [x, y] Float32Array views. The packed
+ * buffer is decoded once per simulation, like simArrays.
+ */
+window.quarterCar.frameXY = function(frames, k, i) {
+    var cache = window.quarterCar._framesCache;
+    if (!cache || cache.source !== frames) {
+        var coords = window.quarterCar.decodeFloat32(frames.coords);
+        var n = frames.num_frames;
+        var offset = 0;
+        cache = window.quarterCar._framesCache = {source: frames, x: [], y: []};
+        frames.points.forEach(function(p) {
+            cache.x.push(coords.subarray(offset, offset + n * p));
+            cache.y.push(coords.subarray(offset + n * p, offset + 2 * n * p));
+            offset += 2 * n * p;
+        });
+    }
+    var p = frames.points[k];
+    return [cache.x[k].subarray(i * p, (i + 1) * p), cache.y[k].subarray(i * p, (i + 1) * p)];
+};
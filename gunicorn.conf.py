@@ -6,3 +6,18 @@ bind = f"{os.environ.get('SERVER_LISTEN_IP', '0.0.0.0')}:{os.environ.get('PORT',
 errorlog = "-"  # pylint: disable=invalid-name
 loglevel = os.environ.get("LOGGER_LEVEL", "info")
 
+
+# Import the app (and run its warm-up) once in the master, then fork workers
+# that share those pages copy-on-write.
+preload_app = True  # pylint: disable=invalid-name
+
+# Requests are short (a Start click is a few milliseconds of CPU), but a
+# page load sends the asset, layout and callback requests together; threads
+# let one worker serve them side by side without a background job queue.
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"  # pylint: disable=invalid-name
+threads = int(os.environ.get("WEB_THREADS", "8"))
+
+# Browsers fetch the page, assets and callback responses over a few
+# connections in quick succession; keep them open between requests.
+keepalive = 5  # pylint: disable=invalid-name
@@ -5,8 +5,9 @@ Converts MATLAB plotSpring.m and plotDamper.m to Python/Plotly.
 Creates animation frames and displacement plots.
 """
 
+import base64
 import numpy as np
-import plotly.graph_objects as go
+import plotly.io as pio
 from typing import List, Tuple
 from simulation import SimulationResult
 
@@ -28,17 +29,77 @@ def get_spring_color(Kt: float) -> str:
     return f'rgb({r}, 0, {b})'
 
 
+# Unit shape templates. A spring or box for any number of frames is one
+# broadcast of these against the per-frame positions.
+# Spring proportions (rodPct and springPct in plotSpring.m): each end rod is
+# SPRING_ROD_PCT of L0, and the zigzag turns at multiples of SPRING_PCT of
+# the coil length.
+SPRING_ROD_PCT = 0.15
+SPRING_PCT = 0.5
+
+# Spring zigzag: lateral offset in units of the spring width, and height in
+# units of the rod length (SPRING_ROD_PCT * L0) plus units of the coil
+# length L.
+SPRING_X = np.array([0, 0, 1, -1, 1, -1, 0, 0], dtype=np.float32)
+SPRING_ROD_Z = np.array([0, 1, 1, 1, 1, 1, 1, 2], dtype=np.float32)
+SPRING_COIL_Z = (SPRING_PCT * np.array([0, 0, 0, 1, 1, 2, 2, 2])).astype(np.float32)
+
+# Closed rectangle, in units of the box width and height
+BOX_X = np.array([-0.5, 0.5, 0.5, -0.5, -0.5], dtype=np.float32)
+BOX_Z = np.array([0, 0, 1, 1, 0], dtype=np.float32)
+
+# Damper proportions (rodLowerPct, rodUpperPct and cylPct in plotDamper.m),
+# as fractions of L0
+DAMPER_ROD_LOWER_PCT = 0.1
+DAMPER_ROD_UPPER_PCT = 0.4
+DAMPER_CYL_PCT = 0.4
+
+# Damper parts: lateral offset in units of the cylinder half-width, and
+# height in units of L0 above the bottom (lower rod, cylinder) or below the
+# top (upper rod, piston).
+DAMPER_ROD_X = np.array([0, 0], dtype=np.float32)
+DAMPER_CYL_X = np.array([-1, -1, 1, 1], dtype=np.float32)
+DAMPER_PISTON_X = np.array([-0.8, 0.8], dtype=np.float32)
+DAMPER_LOWER_ROD_Z = (DAMPER_ROD_LOWER_PCT * np.array([0, 1])).astype(np.float32)
+DAMPER_CYL_Z = (DAMPER_ROD_LOWER_PCT + DAMPER_CYL_PCT * np.array([1, 0, 0, 1])).astype(np.float32)
+DAMPER_UPPER_ROD_Z = (DAMPER_ROD_UPPER_PCT * np.array([0, 1])).astype(np.float32)
+DAMPER_PISTON_Z = (DAMPER_ROD_UPPER_PCT * np.array([1, 1])).astype(np.float32)
+
+
+def encode_array(arr: np.ndarray) -> str:
+    """
+    Encode an array as base64 little-endian float32 bytes.
+    
+    The browser decodes it with quarterCar.decodeFloat32 (assets/clientside.js)
+    straight into a Float32Array, with no per-sample JSON parsing.
+    """
+    return base64.b64encode(np.ascontiguousarray(arr, dtype='<f4').tobytes()).decode('ascii')
+
+
+def typed_array(arr: np.ndarray) -> dict:
+    """
+    Wrap an array in plotly.js's base64 typed-array form.
+    
+    go.Figure emits numpy data this way since plotly 6; figures built as plain
+    dicts have to do it themselves, otherwise the arrays are sent as JSON
+    number lists.
+    """
+    return {'dtype': 'f4', 'bdata': encode_array(arr)}
+
+
 def create_spring_trace(
-    x_center: float,
-    z_bottom: float,
-    z_top: float,
+    x_center: float | np.ndarray,
+    z_bottom: float | np.ndarray,
+    z_top: float | np.ndarray,
     L0: float,
     color: str = 'black',
     width: float = 0.1
-) -> Tuple[List[float], List[float]]:
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Create spring (zigzag) coordinates.
     
+    Positions may be given as arrays over frames to build every frame at once.
+    
     Args:
         x_center: X position of spring center.
         z_bottom: Bottom z coordinate.
@@ -48,43 +109,29 @@ def create_spring_trace(
         width: Spring width.
         
     Returns:
-        Tuple of (x_coords, z_coords) for the spring.
+        Tuple of (x_coords, z_coords) for the spring, each of shape (..., 8).
     """
-    rod_pct = 0.15
-    spring_pct = 0.5
-    
-    L = (z_top - z_bottom) - 2 * rod_pct * L0
-    
-    x_coords = [
-        x_center, x_center,
-        x_center + width, x_center - width,
-        x_center + width, x_center - width,
-        x_center, x_center
-    ]
+    x_center = np.asarray(x_center)[..., None]
+    z_bottom = np.asarray(z_bottom)[..., None]
+    L = (np.asarray(z_top)[..., None] - z_bottom) - 2 * SPRING_ROD_PCT * L0
     
-    z_coords = [
-        z_bottom,
-        z_bottom + rod_pct * L0,
-        z_bottom + rod_pct * L0,
-        z_bottom + rod_pct * L0 + spring_pct * L,
-        z_bottom + rod_pct * L0 + spring_pct * L,
-        z_bottom + rod_pct * L0 + 2 * spring_pct * L,
-        z_bottom + rod_pct * L0 + 2 * spring_pct * L,
-        z_bottom + 2 * rod_pct * L0 + 2 * spring_pct * L
-    ]
+    x_coords = x_center + width * SPRING_X
+    z_coords = z_bottom + SPRING_ROD_PCT * L0 * SPRING_ROD_Z + L * SPRING_COIL_Z
     
     return x_coords, z_coords
 
 
 def create_damper_traces(
-    x_center: float,
-    z_bottom: float,
-    z_top: float,
+    x_center: float | np.ndarray,
+    z_bottom: float | np.ndarray,
+    z_top: float | np.ndarray,
     L0: float
-) -> List[Tuple[List[float], List[float]]]:
+) -> List[Tuple[np.ndarray, np.ndarray]]:
     """
     Create damper component coordinates.
     
+    Positions may be given as arrays over frames to build every frame at once.
+    
     Args:
         x_center: X position of damper center.
         z_bottom: Bottom z coordinate (unsprung mass top).
@@ -94,280 +141,245 @@ def create_damper_traces(
     Returns:
         List of (x_coords, z_coords) tuples for each damper component.
     """
-    rod_lower_pct = 0.1
-    rod_upper_pct = 0.4
-    cyl_pct = 0.4
     w = 0.05
     
-    traces = []
+    x_center = np.asarray(x_center)[..., None]
+    z_bottom = np.asarray(z_bottom)[..., None]
+    z_top = np.asarray(z_top)[..., None]
     
-    # Lower rod
-    rod1_x = [x_center, x_center]
-    rod1_z = [z_bottom, z_bottom + rod_lower_pct * L0]
-    traces.append((rod1_x, rod1_z))
+    def part(x_offsets, z):
+        return np.broadcast_arrays(x_center + w * x_offsets, z)
     
-    # Cylinder
-    cyl_x = [x_center - w, x_center - w, x_center + w, x_center + w]
-    cyl_z = [
-        z_bottom + rod_lower_pct * L0 + cyl_pct * L0,
-        z_bottom + rod_lower_pct * L0,
-        z_bottom + rod_lower_pct * L0,
-        z_bottom + rod_lower_pct * L0 + cyl_pct * L0
+    traces = [
+        part(DAMPER_ROD_X, z_bottom + L0 * DAMPER_LOWER_ROD_Z),   # Lower rod
+        part(DAMPER_CYL_X, z_bottom + L0 * DAMPER_CYL_Z),         # Cylinder
+        part(DAMPER_ROD_X, z_top - L0 * DAMPER_UPPER_ROD_Z),      # Upper rod
+        part(DAMPER_PISTON_X, z_top - L0 * DAMPER_PISTON_Z)       # Piston
     ]
-    traces.append((cyl_x, cyl_z))
-    
-    # Upper rod
-    rod2_x = [x_center, x_center]
-    rod2_z = [z_top, z_top - rod_upper_pct * L0]
-    traces.append((rod2_x, rod2_z))
-    
-    # Piston
-    piston_x = [x_center - 0.8 * w, x_center + 0.8 * w]
-    piston_z = [z_top - rod_upper_pct * L0, z_top - rod_upper_pct * L0]
-    traces.append((piston_x, piston_z))
     
     return traces
 
 
-def create_animation_frame(result: SimulationResult, frame_idx: int) -> go.Figure:
+def create_box_trace(
+    x_center: float | np.ndarray,
+    z_bottom: float | np.ndarray,
+    width: float,
+    height: float
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Create a Plotly figure for a single animation frame.
+    Create closed rectangle coordinates for a mass.
     
     Args:
-        result: Simulation result data.
-        frame_idx: Index of the current frame.
+        x_center: X position of box center.
+        z_bottom: Bottom z coordinate.
+        width: Box width.
+        height: Box height.
         
     Returns:
-        Plotly Figure object.
+        Tuple of (x_coords, z_coords) for the box, each of shape (..., 5).
     """
-    i = frame_idx
-    x_inst = result.lon[i]
-    l_win = 2.5  # Window length
-    
-    fig = go.Figure()
-    
-    # Road profile - OPTIMIZATION: Only render visible section
-    # Window is x_inst +/- l_win/2. Add buffer.
-    x_min, x_max = x_inst - l_win, x_inst + l_win
-    
-    # Filter points within window
-    road_x_extended = np.concatenate([[-10], result.road_x, [100]]) # Add bounds
-    road_z_extended = np.concatenate([[0], result.road_z, [0]])
+    x_coords = np.asarray(x_center)[..., None] + width * BOX_X
+    z_coords = np.asarray(z_bottom)[..., None] + height * BOX_Z
+    return x_coords, z_coords
+
+
+# Layout of the animation graph that is the same for every frame. It is the
+# graph's initial figure; frames only update the title and x-axis range.
+ANIMATION_LAYOUT = {
+    'title': {'text': ''},
+    'xaxis': {},
+    'yaxis': {'range': [-0.1, 1.15], 'title': {'text': 'z [m]'}},
+    'margin': {'l': 50, 'r': 50, 't': 50, 'b': 50},
+    'height': 500,
+    'uirevision': 'constant'
+}
+
+
+def create_animation_frames(result: SimulationResult) -> dict:
+    """
+    Create all animation frames in a column-oriented layout.
     
-    mask = (road_x_extended >= x_min) & (road_x_extended <= x_max)
+    Traces that do not move (the road) are complete trace dicts, sent once;
+    the x-axis range of each frame decides which part of them is visible.
+    The geometry of every moving trace is computed for all frames at once by
+    broadcasting over the simulation arrays, so no per-frame Python code runs.
+    Their styling is stored once per trace, and the coordinates of trace k
+    for every frame are stacked into one (num_frames, num_points) array.
+    Traces are plain dicts rather than graph_objects, so no Plotly validation
+    runs.
     
-    # Add one point on each side to ensure continuity
-    if np.any(mask):
-        idx_first = np.argmax(mask)
-        idx_last = len(mask) - 1 - np.argmax(mask[::-1])
-        idx_start = max(0, idx_first - 1)
-        idx_end = min(len(road_x_extended), idx_last + 2)
+    Args:
+        result: Simulation result data.
         
-        road_x_view = road_x_extended[idx_start:idx_end]
-        road_z_view = road_z_extended[idx_start:idx_end]
-    else:
-        # Fallback if out of bounds (shouldn't happen with padding)
-        road_x_view = [x_min, x_max]
-        road_z_view = [0, 0]
-
-    fig.add_trace(go.Scatter(
-        x=road_x_view,
-        y=road_z_view,
+    Returns:
+        Dict with 'num_frames', 'static_traces' (complete traces drawn below
+        the moving ones), 'traces' (moving trace properties), 'x' and 'y'
+        (one 2D array per moving trace), 'ranges' (per-frame x-axis range,
+        shape (num_frames, 2)) and 'titles' (per-frame title text).
+    """
+    num_frames = len(result.time)
+    x_inst = result.lon
+    l_win = 2.5  # Window length
+    
+    traces, xs, ys = [], [], []
+    
+    # Coordinates are stored as float32: far more precision than the plot
+    # resolution needs, at half the size
+    def add_trace(x, y, **props):
+        traces.append({'type': 'scattergl', 'mode': 'lines', 'showlegend': False, **props})
+        xs.append(x.astype(np.float32))
+        ys.append(y.astype(np.float32))
+    
+    # Road profile, extended flat on both sides so the line always reaches
+    # the window edges
+    road = dict(
+        type='scattergl',
+        x=typed_array(np.concatenate([[-10], result.road_x, [100]])),
+        y=typed_array(np.concatenate([[0], result.road_z, [0]])),
         mode='lines',
         line=dict(color='black', width=3),
-        name='Road',
-        showlegend=False
-    ))
+        showlegend=False,
+        name='Road'
+    )
     
     # Sprung mass (purple box)
-    sprung_x = [
-        x_inst - result.a/2, x_inst + result.a/2,
-        x_inst + result.a/2, x_inst - result.a/2,
-        x_inst - result.a/2
-    ]
-    sprung_z = [
-        result.z_s[i], result.z_s[i],
-        result.z_s[i] + result.h_s, result.z_s[i] + result.h_s,
-        result.z_s[i]
-    ]
-    fig.add_trace(go.Scatter(
-        x=sprung_x,
-        y=sprung_z,
-        mode='lines',
+    sprung_x, sprung_z = create_box_trace(x_inst, result.z_s, result.a, result.h_s)
+    add_trace(
+        sprung_x, sprung_z,
         fill='toself',
         fillcolor='rgb(148, 103, 189)',
         line=dict(color='black', width=2),
-        name='Sprung mass',
-        showlegend=False
-    ))
+        name='Sprung mass'
+    )
     
     # Unsprung mass (cyan box)
-    unsprung_x = [
-        x_inst - result.a/2, x_inst + result.a/2,
-        x_inst + result.a/2, x_inst - result.a/2,
-        x_inst - result.a/2
-    ]
-    unsprung_z = [
-        result.z_u[i], result.z_u[i],
-        result.z_u[i] + result.h_u, result.z_u[i] + result.h_u,
-        result.z_u[i]
-    ]
-    fig.add_trace(go.Scatter(
-        x=unsprung_x,
-        y=unsprung_z,
-        mode='lines',
+    unsprung_x, unsprung_z = create_box_trace(x_inst, result.z_u, result.a, result.h_u)
+    add_trace(
+        unsprung_x, unsprung_z,
         fill='toself',
         fillcolor='rgb(44, 160, 196)',
         line=dict(color='black', width=2),
-        name='Unsprung mass',
-        showlegend=False
-    ))
+        name='Unsprung mass'
+    )
     
     # Tire spring (between road and unsprung mass)
     tire_spring_color = get_spring_color(result.Kt)
     tire_spring_x, tire_spring_z = create_spring_trace(
         x_center=x_inst,
-        z_bottom=result.u[i],
-        z_top=result.z_u[i],
+        z_bottom=result.u,
+        z_top=result.z_u,
         L0=result.L0_u,
         color=tire_spring_color
     )
-    fig.add_trace(go.Scatter(
-        x=tire_spring_x,
-        y=tire_spring_z,
-        mode='lines',
+    add_trace(
+        tire_spring_x, tire_spring_z,
         line=dict(color=tire_spring_color, width=3),
-        name='Tire spring',
-        showlegend=False
-    ))
+        name='Tire spring'
+    )
     
     # Suspension spring (between unsprung and sprung mass)
     susp_spring_x, susp_spring_z = create_spring_trace(
         x_center=x_inst - 0.2,
-        z_bottom=result.z_u[i] + result.h_u,
-        z_top=result.z_s[i],
+        z_bottom=result.z_u + result.h_u,
+        z_top=result.z_s,
         L0=result.L0_s
     )
-    fig.add_trace(go.Scatter(
-        x=susp_spring_x,
-        y=susp_spring_z,
-        mode='lines',
+    add_trace(
+        susp_spring_x, susp_spring_z,
         line=dict(color='black', width=3),
-        name='Suspension spring',
-        showlegend=False
-    ))
+        name='Suspension spring'
+    )
     
     # Damper
     damper_traces = create_damper_traces(
         x_center=x_inst + 0.2,
-        z_bottom=result.z_u[i] + result.h_u,
-        z_top=result.z_s[i],
+        z_bottom=result.z_u + result.h_u,
+        z_top=result.z_s,
         L0=result.L0_s
     )
     for dx, dz in damper_traces:
-        fig.add_trace(go.Scatter(
-            x=dx,
-            y=dz,
-            mode='lines',
-            line=dict(color='black', width=3),
-            showlegend=False
-        ))
+        add_trace(dx, dz, line=dict(color='black', width=3))
     
     # Contact point
-    fig.add_trace(go.Scatter(
-        x=[x_inst],
-        y=[result.u[i]],
+    add_trace(
+        x_inst[:, None], result.u[:, None],
         mode='markers',
         marker=dict(color='black', size=10),
-        name='Contact point',
-        showlegend=False
-    ))
-    
-    # Layout - use uirevision to prevent full redraws
-    fig.update_layout(
-        title=f't = {result.time[i]:.2f} s',
-        xaxis=dict(
-            range=[x_inst - l_win/2, x_inst + l_win/2],
-            title='x [m]',
-            scaleanchor='y',
-            scaleratio=1
-        ),
-        # yaxis=dict(
-        #     range=[-0.1, -0.1 + l_win],
-        #     title='z [m]'
-        # ),
-        showlegend=False,
-        margin=dict(l=50, r=50, t=50, b=50),
-        plot_bgcolor='white',
-        height=500,
-        uirevision='constant'  # Preserves UI state between updates
+        name='Contact point'
     )
     
-    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
-    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
-    
-    return fig
+    # Only the parts of the layout that change between frames; the rest is
+    # ANIMATION_LAYOUT.
+    ranges = np.column_stack([x_inst - l_win/2, x_inst + l_win/2]).astype(np.float32)
+    titles = [f't = {t:.2f} s' for t in result.time]
+    
+    return {
+        'num_frames': num_frames,
+        'static_traces': [road],
+        'traces': traces,
+        'x': xs,
+        'y': ys,
+        'ranges': ranges,
+        'titles': titles
+    }
 
 
-def create_displacement_plot(result: SimulationResult, current_time_idx: int | None = None) -> go.Figure:
+def create_displacement_plot(result: SimulationResult, current_time_idx: int | None = None) -> dict:
     """
     Create the displacement vs time plot.
     
+    Built as a plain figure dict, like the animation frames, so no Plotly
+    validation runs over the full-resolution time series.
+    
     Args:
         result: Simulation result data.
         current_time_idx: Index of current time to show marker (optional).
         
     Returns:
-        Plotly Figure object.
+        Plotly figure dict with 'data' and 'layout'.
     """
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=result.time,
-        y=result.z_s,
-        mode='lines',
-        name='Sprung mass',
-        line=dict(width=2, color='rgb(148, 103, 189)')
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=result.time,
-        y=result.z_u,
-        mode='lines',
-        name='Unsprung mass',
-        line=dict(width=2, color='rgb(44, 160, 196)')
-    ))
+    data = [
+        dict(
+            type='scatter',
+            x=typed_array(result.time),
+            y=typed_array(result.z_s),
+            mode='lines',
+            name='Sprung mass',
+            line=dict(width=2, color='rgb(148, 103, 189)')
+        ),
+        dict(
+            type='scatter',
+            x=typed_array(result.time),
+            y=typed_array(result.z_u),
+            mode='lines',
+            name='Unsprung mass',
+            line=dict(width=2, color='rgb(44, 160, 196)')
+        )
+    ]
     
     # Add current time marker if index provided
     if current_time_idx is not None and 0 <= current_time_idx < len(result.time):
         current_time = result.time[current_time_idx]
-        current_z_s = result.z_s[current_time_idx]
-        current_z_u = result.z_u[current_time_idx]
         
-        # Marker for sprung mass
-        fig.add_trace(go.Scatter(
-            x=[current_time],
-            y=[current_z_s],
-            mode='markers',
-            marker=dict(color='black', size=12, symbol='circle'),
-            name='Current (sprung)',
-            showlegend=False
-        ))
-        
-        # Marker for unsprung mass
-        fig.add_trace(go.Scatter(
-            x=[current_time],
-            y=[current_z_u],
-            mode='markers',
-            marker=dict(color='black', size=12, symbol='circle'),
-            name='Current (unsprung)',
-            showlegend=False
-        ))
-    
-    fig.update_layout(
-        title='Vertical Displacement',
-        xaxis_title='Time [s]',
-        yaxis_title='z [m]',
+        # Markers for sprung and unsprung mass
+        for name, z in (('Current (sprung)', result.z_s), ('Current (unsprung)', result.z_u)):
+            data.append(dict(
+                type='scatter',
+                x=[current_time],
+                y=[z[current_time_idx]],
+                mode='markers',
+                marker=dict(color='black', size=12, symbol='circle'),
+                name=name,
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+    
+    grid = dict(showgrid=True, gridwidth=1, gridcolor='lightgray')
+    layout = dict(
+        template=pio.templates[pio.templates.default],
+        title=dict(text='Vertical Displacement'),
+        xaxis=dict(title=dict(text='Time [s]'), **grid),
+        yaxis=dict(title=dict(text='z [m]'), **grid),
         legend=dict(x=0.7, y=0.5),
         margin=dict(l=50, r=50, t=50, b=50),
         plot_bgcolor='white',
@@ -375,7 +387,4 @@ def create_displacement_plot(result: SimulationResult, current_time_idx: int | N
         uirevision='displacement'  # Preserve zoom/pan state
     )
     
-    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
-    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
-    
-    return fig
+    return dict(data=data, layout=layout)
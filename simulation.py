@@ -2,13 +2,14 @@
 Quarter Car Simulation Module
 
 Converts the MATLAB runQuarterCarSim.m physics simulation to Python.
-Uses scipy.signal for state-space modeling and linear simulation.
+Solves the linear state-space model by exact matrix-exponential
+discretization.
 """
 
 import numpy as np
-from scipy.signal import StateSpace, lsim
-from dataclasses import dataclass
-from typing import Tuple
+from scipy.linalg import expm
+from dataclasses import dataclass, replace
+from typing import ClassVar, Sequence, Tuple
 
 
 @dataclass
@@ -38,6 +39,21 @@ class SimulationResult:
     h_u: float             # Unsprung mass height
     a: float               # Mass width
     Kt: float              # Tire stiffness (for spring color)
+    
+    # Per-sample time series (same length as time), in pack() row order
+    SERIES: ClassVar[Tuple[str, ...]] = ('time', 'z_s', 'z_u', 'u', 'lon')
+    
+    def pack(self, names: Sequence[str] = SERIES) -> np.ndarray:
+        """
+        Pack time series into a single contiguous float32 array.
+        
+        Args:
+            names: Series to include, from SERIES.
+            
+        Returns:
+            Array of shape (len(names), num_samples), one row per series.
+        """
+        return np.stack([getattr(self, name) for name in names]).astype(np.float32)
 
 
 def generate_road_profile() -> Tuple[np.ndarray, np.ndarray]:
@@ -47,27 +63,72 @@ def generate_road_profile() -> Tuple[np.ndarray, np.ndarray]:
     Returns:
         Tuple of (x_coordinates, z_coordinates) for the road.
     """
-    # Flat section before bump
-    x1 = np.arange(0, 1.2, 0.1)
-    z1 = np.zeros_like(x1)
-    
-    # Bump (semicircle)
     R = 0.16  # Bump radius
-    th = np.linspace(0, np.pi, 50)
-    x2 = -R * np.cos(th) + 1.1 + R
-    z2 = R * np.sin(th)
+    x1 = np.arange(0, 1.2, 0.1)                          # Flat section before bump
+    x3 = np.arange(1.1 + 2*R, 1.1 + 2*R + 5.1, 0.1)      # Flat section after bump
+    n_bump = 50
+    
+    # Fill one preallocated pair of arrays; the bump and the flat section
+    # after it each drop their first point, which duplicates the last one
+    # of the section before
+    n1, n2 = len(x1), n_bump - 1
+    Xr = np.empty(n1 + n2 + len(x3) - 1)
+    Zr = np.zeros_like(Xr)
     
-    # Flat section after bump
-    x3 = np.arange(1.1 + 2*R, 1.1 + 2*R + 5.1, 0.1)
-    z3 = np.zeros_like(x3)
+    Xr[:n1] = x1
+    
+    # Bump (semicircle)
+    th = np.linspace(0, np.pi, n_bump)[1:]
+    Xr[n1:n1 + n2] = -R * np.cos(th) + 1.1 + R
+    Zr[n1:n1 + n2] = R * np.sin(th)
     
-    # Concatenate all sections
-    Xr = np.concatenate([x1, x2[1:], x3[1:]])
-    Zr = np.concatenate([z1, z2[1:], z3[1:]])
+    Xr[n1 + n2:] = x3[1:]
     
     return Xr, Zr
 
 
+def simulate_lti(A: np.ndarray, B: np.ndarray, u: np.ndarray, dt: float) -> np.ndarray:
+    """
+    Simulate a single-input LTI system from rest on a uniform time grid.
+    
+    Same method as scipy.signal.lsim with its default linear interpolation
+    (first-order hold) between input samples: the system is discretized once
+    with one matrix exponential and then stepped exactly. The input-driven
+    part of every step is computed for all steps at once, so the loop left is
+    a single 4x4 product per step.
+    
+    Args:
+        A: State matrix, shape (n, n).
+        B: Input matrix, shape (n, 1).
+        u: Input samples.
+        dt: Sample spacing.
+        
+    Returns:
+        State trajectory, shape (len(u), n).
+    """
+    n = A.shape[0]
+    
+    # exp([[A dt, B dt, 0], [0, 0, 1], [0, 0, 0]]) holds the state transition
+    # and the response to a unit input and to a unit input ramp over one step
+    M = np.zeros((n + 2, n + 2))
+    M[:n, :n] = A * dt
+    M[:n, n] = B[:, 0] * dt
+    M[n, n + 1] = 1.0
+    E = expm(M)
+    Ad = E[:n, :n]
+    Bd1 = E[:n, n + 1]
+    Bd0 = E[:n, n] - Bd1
+    
+    forcing = np.outer(u[:-1], Bd0) + np.outer(u[1:], Bd1)
+    
+    # States are rows, so step with the transposed transition matrix
+    AdT = Ad.T
+    x = np.zeros((len(u), n))
+    for k in range(1, len(u)):
+        x[k] = x[k - 1] @ AdT + forcing[k - 1]
+    return x
+
+
 def run_simulation(params: SimulationParams) -> SimulationResult:
     """
     Run the quarter car simulation.
@@ -113,14 +174,6 @@ def run_simulation(params: SimulationParams) -> SimulationResult:
         [Ks / M, Cs / M, -Ks / M, -Cs / M]
     ])
     B = np.array([[0], [Kt / m], [0], [0]])
-    C = np.array([
-        [1, 0, 0, 0],
-        [0, 0, 1, 0]
-    ])
-    D = np.array([[0], [0]])
-    
-    # Create state-space system
-    sys = StateSpace(A, B, C, D)
     
     # Longitudinal position
     lon = vel * time
@@ -128,21 +181,26 @@ def run_simulation(params: SimulationParams) -> SimulationResult:
     # Road input (interpolate road profile at vehicle position)
     u = np.interp(lon, road_x, road_z)
     
-    # Run simulation
-    t_out, y_out, x_out = lsim(sys, u, time)
+    # Run simulation. The model is linear time-invariant, so it is discretized
+    # once with the matrix exponential of A (the constant Jacobian) and
+    # stepped exactly; there is no Python right-hand side to integrate.
+    x = simulate_lti(A, B, u, time[1] - time[0])
     
     # Extract outputs with offset for natural lengths
-    z_u = y_out[:, 0] + L0_u
-    z_s = y_out[:, 1] + L0_u + L0_s
+    z_u = x[:, 0] + L0_u
+    z_s = x[:, 2] + L0_u + L0_s
     
+    # The solve runs in float64; the results are only drawn on screen, so
+    # they are stored as float32 for everything downstream
+    f32 = np.float32
     return SimulationResult(
-        time=time,
-        z_s=z_s,
-        z_u=z_u,
-        u=u,
-        lon=lon,
-        road_x=road_x,
-        road_z=road_z,
+        time=time.astype(f32),
+        z_s=z_s.astype(f32),
+        z_u=z_u.astype(f32),
+        u=u.astype(f32),
+        lon=lon.astype(f32),
+        road_x=road_x.astype(f32),
+        road_z=road_z.astype(f32),
         L0_s=L0_s,
         L0_u=L0_u,
         h_s=h_s,
@@ -150,3 +208,24 @@ def run_simulation(params: SimulationParams) -> SimulationResult:
         a=a,
         Kt=Kt
     )
+
+
+def downsample_result(result: SimulationResult, num_samples: int) -> SimulationResult:
+    """
+    Keep evenly spaced samples of the simulation time series.
+    
+    Every series in SimulationResult.SERIES is down-sampled; the first and
+    last samples are always kept. The road profile and the geometry
+    constants are unchanged.
+    
+    Args:
+        result: Simulation result data.
+        num_samples: Number of samples to keep (capped at the available number).
+        
+    Returns:
+        SimulationResult whose time series have num_samples entries.
+    """
+    num_samples = min(num_samples, len(result.time))
+    idx = np.linspace(0, len(result.time) - 1, num_samples).round().astype(int)
+    
+    return replace(result, **{name: getattr(result, name)[idx] for name in SimulationResult.SERIES})